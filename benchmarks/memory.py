@@ -0,0 +1,92 @@
+import os
+import sys
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hangman
+import pong
+import snake
+import tictactoe
+
+SESSIONS = 10000
+SNAKE_LENGTH = 50
+
+def measure(factory):
+    tracemalloc.start()
+    sessions = [factory(i) for i in range(SESSIONS)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sessions
+    return size
+
+def snake_cells(i):
+    return [((i + j) % (snake.WIDTH - 2) + 1, j % (snake.HEIGHT - 2) + 1) for j in range(SNAKE_LENGTH)]
+
+def old_snake(i):
+    return snake_cells(i)
+
+def new_snake(i):
+    return snake.SnakeBody(snake_cells(i), SNAKE_LENGTH)
+
+def old_pong(i):
+    return {
+        "computer_paddle_pos": pong.HEIGHT // 2 - pong.PADDLE_HEIGHT // 2,
+        "player_paddle_pos": pong.HEIGHT // 2 - pong.PADDLE_HEIGHT // 2,
+        "ball_x": pong.WIDTH // 2 + 0.5,
+        "ball_y": pong.HEIGHT // 2 + 0.5,
+        "ball_dx": random.choice([-1, 1]),
+        "ball_dy": 0.25,
+        "computer_score": i,
+        "player_score": i
+    }
+
+def new_pong(i):
+    state = pong.PongState()
+    state.ball_x += 0.5
+    state.ball_y += 0.5
+    state.ball_dy = 0.25
+    state.computer_score = i
+    state.player_score = i
+    return state
+
+def board_cells(i):
+    return [random.choice([tictactoe.EMPTY, tictactoe.PLAYER, tictactoe.COMPUTER]) for _ in range(9)]
+
+def old_tictactoe(i):
+    return board_cells(i)
+
+def new_tictactoe(i):
+    board = tictactoe.Board()
+    for index, cell in enumerate(board_cells(i)):
+        board[index] = cell
+    return board
+
+def guess_letters(i):
+    return random.sample("abcdefghijklmnopqrstuvwxyz", i % 12)
+
+def old_hangman(i):
+    return set(guess_letters(i))
+
+def new_hangman(i):
+    guesses = hangman.Guesses()
+    for letter in guess_letters(i):
+        guesses.add(letter)
+    return guesses
+
+def main():
+    games = [
+        ("snake", old_snake, new_snake),
+        ("pong", old_pong, new_pong),
+        ("tictactoe", old_tictactoe, new_tictactoe),
+        ("hangman", old_hangman, new_hangman)
+    ]
+    print(f"{'game':<12}{'before':>14}{'after':>14}{'ratio':>8}   ({SESSIONS} sessions)")
+    for name, old_factory, new_factory in games:
+        before = measure(old_factory)
+        after = measure(new_factory)
+        print(f"{name:<12}{before:>14,}{after:>14,}{before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import time
+import math
+import random
+import argparse
+import platform
+import statistics
+import itertools
+import contextlib
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hangman
+import pong
+import snake
+import tictactoe
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SAMPLES = 10
+RUNS = 5
+MIN_RUNS = 4
+ALPHA = 0.05
+MIN_SAMPLE_TIME = 0.02
+THRESHOLD = 0.10
+RING_SIZE = 300
+SNAKE_LENGTHS = [10, 100, 1000]
+HANGMAN_WORD_LENGTHS = [1000, 10000]
+
+def snake_ring(size):
+    return (
+        [(x, 1) for x in range(1, size - 1)]
+        + [(size - 2, y) for y in range(2, size - 1)]
+        + [(x, size - 2) for x in range(size - 3, 0, -1)]
+        + [(1, y) for y in range(size - 3, 1, -1)]
+    )
+
+def ring_snake(length, size=RING_SIZE):
+    ring = snake_ring(size)
+    level = snake.Level(size, size)
+    body = snake.SnakeBody(reversed(ring[:length]))
+    snake.place_snake(level, body)
+    directions = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(ring, ring[1:] + ring[:1])]
+    return level, body, itertools.cycle(directions[length - 1:] + directions[:length - 1])
+
+def bench_snake_update_game(length):
+    level, body, directions = ring_snake(length)
+    food = (RING_SIZE // 2, RING_SIZE // 2)
+    def run():
+        if not snake.update_game(body, next(directions), food, level)[0]:
+            raise RuntimeError("benchmark snake collided")
+    return run
+
+def bench_snake_spawn_food(length):
+    level, body, _ = ring_snake(length)
+    return lambda: snake.spawn_food(body, level)
+
+def bench_snake_draw_board():
+    level = snake.Level(snake.WIDTH, snake.HEIGHT)
+    body = snake.SnakeBody(reversed(snake_ring(snake.HEIGHT)[:30]))
+    snake.place_snake(level, body)
+    food = snake.spawn_food(body, level)
+    return lambda: snake.draw_board(body, food, 30, level)
+
+def bench_pong_update_ball():
+    state = pong.PongState()
+    def run():
+        pong.update_computer_paddle(state)
+        pong.update_ball(state)
+    return run
+
+def bench_pong_draw_board():
+    state = pong.PongState()
+    return lambda: pong.draw_board(state)
+
+def reachable_boards():
+    boards = []
+    seen = set()
+    stack = [tictactoe.initialize_board()]
+    while stack:
+        board = stack.pop()
+        if board.snapshot() in seen:
+            continue
+        seen.add(board.snapshot())
+        boards.append(board)
+        if tictactoe.check_winner(board):
+            continue
+        player_turn = bin(board.player).count("1") == bin(board.computer).count("1")
+        for index in range(9):
+            if board[index] == tictactoe.EMPTY:
+                child = board.copy()
+                child[index] = tictactoe.PLAYER if player_turn else tictactoe.COMPUTER
+                stack.append(child)
+    return boards
+
+def bench_tictactoe_check_winner():
+    boards = reachable_boards()
+    def run():
+        for board in boards:
+            tictactoe.check_winner(board)
+    return run
+
+def bench_tictactoe_computer_move():
+    boards = [
+        board for board in reachable_boards()
+        if not tictactoe.check_winner(board) and bin(board.player).count("1") > bin(board.computer).count("1")
+    ]
+    def run():
+        for board in boards:
+            tictactoe.computer_move(board)
+    return run
+
+def bench_tictactoe_draw_board():
+    board = tictactoe.initialize_board()
+    for index, cell in enumerate("XO X O  X"):
+        board[index] = cell
+    return lambda: tictactoe.draw_board(board, 2, True, "Your turn")
+
+def bench_hangman_draw_board(length=None):
+    word = "programming" if length is None else ("abcdefghijklmnopqrstuvwxyz" * (length // 26 + 1))[:length]
+    guesses = hangman.Guesses()
+    for letter in "aeiourstlnp":
+        guesses.add(letter)
+    return lambda: hangman.draw_board(word, guesses, 3)
+
+def benchmarks():
+    suite = []
+    for length in SNAKE_LENGTHS:
+        suite.append((f"snake.update_game[length={length}]", lambda length=length: bench_snake_update_game(length)))
+    for length in SNAKE_LENGTHS:
+        suite.append((f"snake.spawn_food[length={length}]", lambda length=length: bench_snake_spawn_food(length)))
+    suite.append(("snake.draw_board", bench_snake_draw_board))
+    suite.append(("pong.update_ball", bench_pong_update_ball))
+    suite.append(("pong.draw_board", bench_pong_draw_board))
+    suite.append(("tictactoe.check_winner[all boards]", bench_tictactoe_check_winner))
+    suite.append(("tictactoe.computer_move[all boards]", bench_tictactoe_computer_move))
+    suite.append(("tictactoe.draw_board", bench_tictactoe_draw_board))
+    suite.append(("hangman.draw_board", bench_hangman_draw_board))
+    for length in HANGMAN_WORD_LENGTHS:
+        suite.append((f"hangman.draw_board[length={length}]", lambda length=length: bench_hangman_draw_board(length)))
+    return suite
+
+def calibrate(run):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - start >= MIN_SAMPLE_TIME:
+            return number
+        number *= 2
+
+def sample(run, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    return (time.perf_counter() - start) / number
+
+def run_suite(name_filter, samples):
+    os.environ["COLUMNS"] = "1000"
+    os.environ["LINES"] = "1000"
+    for module in (hangman, pong, snake, tictactoe):
+        module.clear = lambda: None
+    random.seed(0)
+    order = random.Random(0)
+    suite = [(name, factory()) for name, factory in benchmarks() if name_filter in name]
+    times = {name: [] for name, _ in suite}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        numbers = {}
+        for name, run in suite:
+            numbers[name] = calibrate(run)
+            sample(run, numbers[name])
+        for _ in range(samples):
+            order.shuffle(suite)
+            for name, run in suite:
+                times[name].append(sample(run, numbers[name]))
+    return times
+
+def measure_runs(name_filter, samples, runs):
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--samples", str(samples), "--filter", name_filter]
+    env = dict(os.environ, PYTHONHASHSEED="0")
+    medians = {}
+    for _ in range(runs):
+        output = subprocess.run(command, env=env, stdout=subprocess.PIPE, check=True, text=True).stdout
+        for name, times in json.loads(output).items():
+            medians.setdefault(name, []).append(statistics.median(times))
+    return medians
+
+def mann_whitney_p(baseline, current):
+    u = sum(1 if c > b else 0.5 if c == b else 0 for c in current for b in baseline)
+    counts = [[[1] for _ in range(len(current) + 1)] for _ in range(len(baseline) + 1)]
+    for i in range(1, len(baseline) + 1):
+        for j in range(1, len(current) + 1):
+            dist = [0] * (i * j + 1)
+            for value, count in enumerate(counts[i][j - 1]):
+                dist[value + i] += count
+            for value, count in enumerate(counts[i - 1][j]):
+                dist[value] += count
+            counts[i][j] = dist
+    dist = counts[len(baseline)][len(current)]
+    return sum(dist[math.ceil(u):]) / math.comb(len(baseline) + len(current), len(current))
+
+def min_p(baseline_runs, current_runs):
+    return 1 / math.comb(baseline_runs + current_runs, current_runs)
+
+def format_time(seconds):
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "node": platform.node()
+    }
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+def save_baseline(path, entries):
+    with open(path, "w") as file:
+        json.dump({"environment": environment(), "benchmarks": entries}, file, indent=2)
+
+def baseline_entry(medians):
+    return {"median": statistics.median(medians), "runs": medians}
+
+def usable_entry(entry, runs):
+    return "median" in entry and min_p(len(entry["runs"]), runs) < ALPHA
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the games' hot paths against a stored baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="record a new baseline for the selected benchmarks")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="smallest significant slowdown that fails the gate, e.g. 0.10")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="interleaved samples per benchmark in each run")
+    parser.add_argument("--runs", type=int, default=RUNS, help="separate processes to measure in")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.runs < MIN_RUNS and not args.child:
+        parser.error(f"--runs must be at least {MIN_RUNS} for the rank test to reach p < {ALPHA}")
+    if args.child:
+        json.dump(run_suite(args.filter, args.samples), sys.stdout)
+        return 0
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get("environment") != environment() and not args.save:
+        print(f"{args.baseline} was recorded in a different environment:")
+        print(f"  baseline: {baseline.get('environment')}")
+        print(f"  current:  {environment()}")
+        print("Run with --save to record a new baseline here.")
+        return 2
+    entries = dict(baseline["benchmarks"]) if baseline else {}
+    results = measure_runs(args.filter, args.samples, args.runs)
+    regressions = []
+    added = []
+    print(f"{'benchmark':<38}{'median':>12}{'baseline':>12}{'change':>9}{'p':>8}")
+    for name, medians in results.items():
+        median = statistics.median(medians)
+        if args.save or name not in entries or not usable_entry(entries[name], args.runs):
+            entries[name] = baseline_entry(medians)
+            added.append(name)
+            print(f"{name:<38}{format_time(median):>12}{'-':>12}{'saved':>9}")
+            continue
+        base = entries[name]
+        change = median / base["median"] - 1
+        p = mann_whitney_p(base["runs"], medians)
+        status = ""
+        if change > args.threshold and p < ALPHA:
+            status = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<38}{format_time(median):>12}{format_time(base['median']):>12}{change:>+9.1%}{p:>8.3f}{status}")
+    if added:
+        save_baseline(args.baseline, entries)
+        print(f"\nSaved {len(added)} benchmark(s) to {args.baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed significantly beyond the threshold: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
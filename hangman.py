@@ -1,31 +1,54 @@
 import os
+import bisect
 import time
 import random
 
 try:
     import msvcrt
-    def get_key():
-        if msvcrt.kbhit():
-            key = msvcrt.getch()
-            return key
-        return None
+    import sys, ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.ReadConsoleInputW.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    console_input = msvcrt.get_osfhandle(sys.stdin.fileno())
+    def read_key(timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        record = ctypes.create_string_buffer(20)
+        count = wintypes.DWORD()
+        while not msvcrt.kbhit():
+            if deadline is None:
+                wait_ms = 0xFFFFFFFF
+            else:
+                wait_ms = int(max(0, deadline - time.perf_counter()) * 1000)
+            if kernel32.WaitForSingleObject(console_input, wait_ms) != 0:
+                return None
+            if not msvcrt.kbhit():
+                kernel32.ReadConsoleInputW(console_input, record, 1, ctypes.byref(count))
+        return msvcrt.getch()
 except ImportError:
     try:
         import termios
-        import sys, tty, select
-        def get_key():
-            if sys.stdin.isatty():
-                fd = sys.stdin.fileno()
-                old_settings = termios.tcgetattr(fd)
-                try:
-                    tty.setcbreak(fd)
-                    if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-                        return sys.stdin.read(1)
-                finally:
-                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        import sys, tty, select, atexit
+        terminal_settings = None
+        def read_key(timeout=None):
+            global terminal_settings
+            fd = sys.stdin.fileno()
+            if terminal_settings is None and sys.stdin.isatty():
+                terminal_settings = termios.tcgetattr(fd)
+                tty.setcbreak(fd)
+                atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, terminal_settings)
+            if select.select([fd], [], [], timeout)[0]:
+                key = os.read(fd, 1)
+                if not key:
+                    sys.exit()
+                return key
             return None
     except ImportError:
-        def get_key():
+        def read_key(timeout=None):
+            if timeout is None:
+                raise SystemExit
+            time.sleep(timeout)
             return None
 
 WIDTH = 60
@@ -38,11 +61,64 @@ WORD_LIST = [
     "software", "syntax", "terminal", "variable", "workflow"
 ]
 MAX_ATTEMPTS = 6
-FPS = 30
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+keypress_time = None
+
+class Guesses:
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __len__(self):
+        return bin(self.mask).count("1")
+
+    def __contains__(self, letter):
+        return "a" <= letter <= "z" and self.mask >> (ord(letter) - 97) & 1 == 1
+
+    def __iter__(self):
+        for i in range(26):
+            if self.mask >> i & 1:
+                yield chr(97 + i)
+
+    def add(self, letter):
+        self.mask |= 1 << (ord(letter) - 97)
+
+    def snapshot(self):
+        return self.mask
+
+    def restore(self, snapshot):
+        self.mask = snapshot
 
 def clear():
     os.system("cls" if os.name == "nt" else "clear")
 
+def wait_key(timeout=None):
+    global keypress_time
+    key = read_key(timeout)
+    if key and keypress_time is None:
+        keypress_time = time.perf_counter()
+    return key
+
+def record_frame():
+    global keypress_time
+    if keypress_time is not None:
+        latency_ms = (time.perf_counter() - keypress_time) * 1000
+        latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        keypress_time = None
+
+def print_latency_histogram():
+    if not os.environ.get("CLI_GAMES_LATENCY"):
+        return
+    total = sum(latency_histogram)
+    labels = [f"<= {bucket} ms" for bucket in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]} ms"]
+    print(f"\nKeypress-to-frame latency ({total} samples)")
+    for label, count in zip(labels, latency_histogram):
+        bar = "#" * (40 * count // total) if total else ""
+        print(f"{label:>10} {count:>6} {bar}")
+
 def title():
     clear()
     title = [
@@ -65,10 +141,9 @@ def title():
     print("\n" + " " * ((WIDTH - len(src)) // 2) + src)
     print("\n" + " " * ((WIDTH - len(prompt)) // 2) + prompt)
     while True:
-        key = get_key()
+        key = wait_key()
         if key in [b'\r', b'\n', 13, b'\r\n']:
             break
-        time.sleep(0.1)
 
 def get_hangman_art(attempts):
     stages = [
@@ -155,9 +230,10 @@ def draw_board(word, guessed_letters, attempts):
         print("\nGuessed letters: None")
     print(f"\nAttempts remaining: {attempts}")
     print("\nType a letter to guess or press spacebar to quit")
+    record_frame()
 
-def check_input(guessed_letters):
-    key = get_key()
+def check_input(guessed_letters, timeout=0):
+    key = wait_key(timeout)
     if not key:
         return None, True
     if key == b" ":
@@ -165,7 +241,7 @@ def check_input(guessed_letters):
     try:
         if isinstance(key, bytes):
             key = key.decode("utf-8").lower()
-        if key.isalpha() and len(key) == 1:
+        if len(key) == 1 and "a" <= key <= "z":
             return key, True
     except:
         pass
@@ -174,13 +250,13 @@ def check_input(guessed_letters):
 def main():
     title()
     word = random.choice(WORD_LIST).lower()
-    guessed_letters = set()
+    guessed_letters = Guesses()
     attempts = MAX_ATTEMPTS
     running = True
     draw_board(word, guessed_letters, attempts)
     time.sleep(1)
     while running:
-        guess, running = check_input(guessed_letters)
+        guess, running = check_input(guessed_letters, None)
         if not running:
             break
         if guess and guess not in guessed_letters:
@@ -196,9 +272,9 @@ def main():
             print("\nCongratulations! You guessed the word!")
             time.sleep(2)
             break
-        time.sleep(1 / FPS)
     clear()
     print(f"\n\n{'=' * 20}\n  GAME OVER\n  Word: {word}\n{'=' * 20}")
+    print_latency_histogram()
     time.sleep(2)
 
 if __name__ == "__main__":
@@ -1,31 +1,54 @@
 import os
+import bisect
 import time
 import random
 
 try:
     import msvcrt
-    def get_key():
-        if msvcrt.kbhit():
-            key = msvcrt.getch()
-            return key
-        return None
+    import sys, ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.ReadConsoleInputW.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    console_input = msvcrt.get_osfhandle(sys.stdin.fileno())
+    def read_key(timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        record = ctypes.create_string_buffer(20)
+        count = wintypes.DWORD()
+        while not msvcrt.kbhit():
+            if deadline is None:
+                wait_ms = 0xFFFFFFFF
+            else:
+                wait_ms = int(max(0, deadline - time.perf_counter()) * 1000)
+            if kernel32.WaitForSingleObject(console_input, wait_ms) != 0:
+                return None
+            if not msvcrt.kbhit():
+                kernel32.ReadConsoleInputW(console_input, record, 1, ctypes.byref(count))
+        return msvcrt.getch()
 except ImportError:
     try:
         import termios
-        import sys, tty, select
-        def get_key():
-            if sys.stdin.isatty():
-                fd = sys.stdin.fileno()
-                old_settings = termios.tcgetattr(fd)
-                try:
-                    tty.setcbreak(fd)
-                    if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-                        return sys.stdin.read(1)
-                finally:
-                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        import sys, tty, select, atexit
+        terminal_settings = None
+        def read_key(timeout=None):
+            global terminal_settings
+            fd = sys.stdin.fileno()
+            if terminal_settings is None and sys.stdin.isatty():
+                terminal_settings = termios.tcgetattr(fd)
+                tty.setcbreak(fd)
+                atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, terminal_settings)
+            if select.select([fd], [], [], timeout)[0]:
+                key = os.read(fd, 1)
+                if not key:
+                    sys.exit()
+                return key
             return None
     except ImportError:
-        def get_key():
+        def read_key(timeout=None):
+            if timeout is None:
+                raise SystemExit
+            time.sleep(timeout)
             return None
 
 WIDTH = 60
@@ -36,19 +59,65 @@ PADDLE_CHAR = "█"
 BORDER_CHAR = "■"
 EMPTY_CHAR = " "
 FPS = 30
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
 
-computer_paddle_pos = HEIGHT // 2 - PADDLE_HEIGHT // 2
-player_paddle_pos = HEIGHT // 2 - PADDLE_HEIGHT // 2
-ball_x = WIDTH // 2
-ball_y = HEIGHT // 2
-ball_dx = random.choice([-1, 1])
-ball_dy = 0
-computer_score = 0
-player_score = 0
+latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+keypress_time = None
+
+class PongState:
+    __slots__ = (
+        "computer_paddle_pos", "player_paddle_pos",
+        "ball_x", "ball_y", "ball_dx", "ball_dy",
+        "computer_score", "player_score"
+    )
+
+    def __init__(self):
+        self.computer_paddle_pos = HEIGHT // 2 - PADDLE_HEIGHT // 2
+        self.player_paddle_pos = HEIGHT // 2 - PADDLE_HEIGHT // 2
+        self.ball_x = WIDTH // 2
+        self.ball_y = HEIGHT // 2
+        self.ball_dx = random.choice([-1, 1])
+        self.ball_dy = 0
+        self.computer_score = 0
+        self.player_score = 0
+
+    def snapshot(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def restore(self, snapshot):
+        for name, value in zip(self.__slots__, snapshot):
+            setattr(self, name, value)
 
 def clear():
     os.system("cls" if os.name == "nt" else "clear")
 
+def wait_key(timeout=None):
+    global keypress_time
+    key = read_key(timeout)
+    if key and keypress_time is None:
+        keypress_time = time.perf_counter()
+    return key
+
+def get_key():
+    return wait_key(0)
+
+def record_frame():
+    global keypress_time
+    if keypress_time is not None:
+        latency_ms = (time.perf_counter() - keypress_time) * 1000
+        latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        keypress_time = None
+
+def print_latency_histogram():
+    if not os.environ.get("CLI_GAMES_LATENCY"):
+        return
+    total = sum(latency_histogram)
+    labels = [f"<= {bucket} ms" for bucket in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]} ms"]
+    print(f"\nKeypress-to-frame latency ({total} samples)")
+    for label, count in zip(labels, latency_histogram):
+        bar = "#" * (40 * count // total) if total else ""
+        print(f"{label:>10} {count:>6} {bar}")
+
 def title():
     clear()
     title = [
@@ -71,106 +140,106 @@ def title():
     print("\n" + " " * ((WIDTH - len(src)) // 2) + src)
     print("\n" + " " * ((WIDTH - len(prompt)) // 2) + prompt)
     while True:
-        key = get_key()
+        key = wait_key()
         if key in [b'\r', b'\n', 13, b'\r\n']:
             break
-        time.sleep(0.1)
 
-def draw_board():
+def draw_board(state):
     board = [[EMPTY_CHAR for _ in range(WIDTH)] for _ in range(HEIGHT)]
     for i in range(WIDTH):
         board[0][i] = BORDER_CHAR
         board[HEIGHT - 1][i] = BORDER_CHAR
     for i in range(PADDLE_HEIGHT):
-        if 0 < computer_paddle_pos + i < HEIGHT - 1:
-            board[computer_paddle_pos + i][1] = PADDLE_CHAR
-        if 0 < player_paddle_pos + i < HEIGHT - 1:
-            board[player_paddle_pos + i][WIDTH - 2] = PADDLE_CHAR
-    ball_y_int = int(ball_y)
-    ball_x_int = int(ball_x)
+        if 0 < state.computer_paddle_pos + i < HEIGHT - 1:
+            board[state.computer_paddle_pos + i][1] = PADDLE_CHAR
+        if 0 < state.player_paddle_pos + i < HEIGHT - 1:
+            board[state.player_paddle_pos + i][WIDTH - 2] = PADDLE_CHAR
+    ball_y_int = int(state.ball_y)
+    ball_x_int = int(state.ball_x)
     if 0 < ball_y_int < HEIGHT - 1 and 0 < ball_x_int < WIDTH - 1:
         board[ball_y_int][ball_x_int] = BALL_CHAR
     clear()
-    print(f"Computer: {computer_score} | Player: {player_score}")
+    print(f"Computer: {state.computer_score} | Player: {state.player_score}")
     for row in board:
         print("".join(row))
     print("Controls: W/S/up/down keys to move paddle, spacebar to quit")
+    record_frame()
 
-def check_input():
-    global player_paddle_pos
-    key = get_key()
+def check_input(state, timeout=0):
+    key = wait_key(timeout)
     if key:
-        if key == b"w" and player_paddle_pos > 1:
-            player_paddle_pos -= 1
-        elif key == b"s" and player_paddle_pos < HEIGHT - PADDLE_HEIGHT - 1:
-            player_paddle_pos += 1
+        if key == b"w" and state.player_paddle_pos > 1:
+            state.player_paddle_pos -= 1
+        elif key == b"s" and state.player_paddle_pos < HEIGHT - PADDLE_HEIGHT - 1:
+            state.player_paddle_pos += 1
         elif key == b" ":
             return False
         if key == b"\xe0":
             key = get_key()
-            if key == b"H" and player_paddle_pos > 1:
-                player_paddle_pos -= 1
-            elif key == b"P" and player_paddle_pos < HEIGHT - PADDLE_HEIGHT - 1:
-                player_paddle_pos += 1
+            if key == b"H" and state.player_paddle_pos > 1:
+                state.player_paddle_pos -= 1
+            elif key == b"P" and state.player_paddle_pos < HEIGHT - PADDLE_HEIGHT - 1:
+                state.player_paddle_pos += 1
     return True
 
-def update_computer_paddle():
-    global computer_paddle_pos
-    if 1 < ball_y < HEIGHT - 2:
-        target_y = ball_y - PADDLE_HEIGHT // 2
-        if target_y < computer_paddle_pos - 1:
-            computer_paddle_pos = max(1, computer_paddle_pos - 1)
-        elif target_y > computer_paddle_pos + 1:
-            computer_paddle_pos = min(HEIGHT - PADDLE_HEIGHT - 1, computer_paddle_pos + 1)
-
-def update_ball():
-    global ball_x, ball_y, ball_dx, ball_dy, computer_score, player_score
-    ball_x += ball_dx
-    ball_y += ball_dy
-    if ball_y <= 1 or ball_y >= HEIGHT - 2:
-        ball_dy *= -1
-    if ball_x <= 2 and computer_paddle_pos <= ball_y < computer_paddle_pos + PADDLE_HEIGHT:
-        ball_dx = abs(ball_dx)
-        relative_position = (ball_y - computer_paddle_pos) / PADDLE_HEIGHT
-        old_dy = ball_dy * 0.5 
+def update_computer_paddle(state):
+    if 1 < state.ball_y < HEIGHT - 2:
+        target_y = state.ball_y - PADDLE_HEIGHT // 2
+        if target_y < state.computer_paddle_pos - 1:
+            state.computer_paddle_pos = max(1, state.computer_paddle_pos - 1)
+        elif target_y > state.computer_paddle_pos + 1:
+            state.computer_paddle_pos = min(HEIGHT - PADDLE_HEIGHT - 1, state.computer_paddle_pos + 1)
+
+def update_ball(state):
+    state.ball_x += state.ball_dx
+    state.ball_y += state.ball_dy
+    if state.ball_y <= 1 or state.ball_y >= HEIGHT - 2:
+        state.ball_dy *= -1
+    if state.ball_x <= 2 and state.computer_paddle_pos <= state.ball_y < state.computer_paddle_pos + PADDLE_HEIGHT:
+        state.ball_dx = abs(state.ball_dx)
+        relative_position = (state.ball_y - state.computer_paddle_pos) / PADDLE_HEIGHT
+        old_dy = state.ball_dy * 0.5 
         new_dy = (relative_position - 0.5) * 2
-        ball_dy = new_dy + old_dy
-        ball_x = 3
-    if ball_x >= WIDTH - 3 and player_paddle_pos <= ball_y < player_paddle_pos + PADDLE_HEIGHT:
-        ball_dx = -abs(ball_dx)
-        relative_position = (ball_y - player_paddle_pos) / PADDLE_HEIGHT
-        old_dy = ball_dy * 0.5
+        state.ball_dy = new_dy + old_dy
+        state.ball_x = 3
+    if state.ball_x >= WIDTH - 3 and state.player_paddle_pos <= state.ball_y < state.player_paddle_pos + PADDLE_HEIGHT:
+        state.ball_dx = -abs(state.ball_dx)
+        relative_position = (state.ball_y - state.player_paddle_pos) / PADDLE_HEIGHT
+        old_dy = state.ball_dy * 0.5
         new_dy = (relative_position - 0.5) * 2
-        ball_dy = new_dy + old_dy
-        ball_x = WIDTH - 4
-    if ball_x <= 0:
-        player_score += 1
-        reset_ball()
-    elif ball_x >= WIDTH - 1:
-        computer_score += 1
-        reset_ball()
-
-def reset_ball():
-    global ball_x, ball_y, ball_dx, ball_dy
-    ball_x = WIDTH // 2
-    ball_y = HEIGHT // 2
-    ball_dx = random.choice([-1, 1])
-    ball_dy = 0
+        state.ball_dy = new_dy + old_dy
+        state.ball_x = WIDTH - 4
+    if state.ball_x <= 0:
+        state.player_score += 1
+        reset_ball(state)
+    elif state.ball_x >= WIDTH - 1:
+        state.computer_score += 1
+        reset_ball(state)
+
+def reset_ball(state):
+    state.ball_x = WIDTH // 2
+    state.ball_y = HEIGHT // 2
+    state.ball_dx = random.choice([-1, 1])
+    state.ball_dy = 0
 
 def main():
     title()
+    state = PongState()
     running = True
-    draw_board()
-    time.sleep(1)
+    draw_board(state)
+    next_tick = time.perf_counter() + 1
     while running:
-        for _ in range(60):
-            if not running:
-                break
-            running = check_input()
-        update_computer_paddle()
-        update_ball()
-        draw_board()
-        time.sleep(1 / FPS)
+        timeout = next_tick - time.perf_counter()
+        while running and timeout > 0:
+            running = check_input(state, timeout)
+            timeout = next_tick - time.perf_counter()
+        if not running:
+            break
+        update_computer_paddle(state)
+        update_ball(state)
+        draw_board(state)
+        next_tick = time.perf_counter() + 1 / FPS
+    print_latency_histogram()
 
 if __name__ == "__main__":
     main()
@@ -1,31 +1,59 @@
 import os
+import bisect
 import time
+import zlib
 import random
+import shutil
+import struct
+import argparse
+from array import array
 
 try:
     import msvcrt
-    def get_key():
-        if msvcrt.kbhit():
-            key = msvcrt.getch()
-            return key
-        return None
+    import sys, ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.ReadConsoleInputW.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    console_input = msvcrt.get_osfhandle(sys.stdin.fileno())
+    def read_key(timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        record = ctypes.create_string_buffer(20)
+        count = wintypes.DWORD()
+        while not msvcrt.kbhit():
+            if deadline is None:
+                wait_ms = 0xFFFFFFFF
+            else:
+                wait_ms = int(max(0, deadline - time.perf_counter()) * 1000)
+            if kernel32.WaitForSingleObject(console_input, wait_ms) != 0:
+                return None
+            if not msvcrt.kbhit():
+                kernel32.ReadConsoleInputW(console_input, record, 1, ctypes.byref(count))
+        return msvcrt.getch()
 except ImportError:
     try:
         import termios
-        import sys, tty, select
-        def get_key():
-            if sys.stdin.isatty():
-                fd = sys.stdin.fileno()
-                old_settings = termios.tcgetattr(fd)
-                try:
-                    tty.setcbreak(fd)
-                    if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-                        return sys.stdin.read(1)
-                finally:
-                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        import sys, tty, select, atexit
+        terminal_settings = None
+        def read_key(timeout=None):
+            global terminal_settings
+            fd = sys.stdin.fileno()
+            if terminal_settings is None and sys.stdin.isatty():
+                terminal_settings = termios.tcgetattr(fd)
+                tty.setcbreak(fd)
+                atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, terminal_settings)
+            if select.select([fd], [], [], timeout)[0]:
+                key = os.read(fd, 1)
+                if not key:
+                    sys.exit()
+                return key
             return None
     except ImportError:
-        def get_key():
+        def read_key(timeout=None):
+            if timeout is None:
+                raise SystemExit
+            time.sleep(timeout)
             return None
 
 WIDTH = 40
@@ -36,11 +64,165 @@ HEAD_CHAR = "■"
 FOOD_CHAR = "●"
 BORDER_CHAR = "▓"
 EMPTY_CHAR = " "
+AI_HEAD_CHAR = "◆"
+AI_BODY_CHAR = "▒"
 FPS = 10
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+ARENA_WIDTH = 120
+ARENA_HEIGHT = 40
+ARENA_AI_SNAKES = 24
+ARENA_FOOD = 30
+EMPTY_CELL = 0
+SNAKE_CELL = 1
+WALL_CELL = 2
+DIRECTIONS = [(0, -1), (-1, 0), (0, 1), (1, 0)]
+MIN_LEVEL_SIZE = 10
+MAX_LEVEL_SIZE = 65535
+FREE_CELL_ATTEMPTS = 64
+LEVEL_KINDS = ["empty", "maze", "rooms", "blobs"]
+LEVEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "cli-games", "snake")
+LEVEL_MAGIC = b"SNKL"
+LEVEL_HEADER = struct.Struct("<4sII")
+MAZE_CORRIDOR = 2
+MAZE_LOOPS = 0.15
+ROOM_SIZE = 14
+ROOM_DOOR = 3
+BLOB_AREA = 120
+BLOB_SIZE = 24
+UNPACK_TABLE = [bytes(WALL_CELL if byte >> bit & 1 else EMPTY_CELL for bit in range(8)) for byte in range(256)]
+PACK_TABLE = {cells: byte for byte, cells in enumerate(UNPACK_TABLE)}
+WALLS_ONLY = bytes(WALL_CELL if cell == WALL_CELL else EMPTY_CELL for cell in range(256))
+
+latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+keypress_time = None
+
+class SnakeBody:
+    __slots__ = ("coords", "start", "length")
+
+    def __init__(self, cells=(), capacity=16):
+        self.coords = array("H", [0]) * (2 * capacity)
+        self.start = 0
+        self.length = 0
+        for cell in cells:
+            self.append(cell)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("snake index out of range")
+        index = 2 * ((self.start + i) % (len(self.coords) // 2))
+        return (self.coords[index], self.coords[index + 1])
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self[i]
+
+    def __contains__(self, cell):
+        return any(part == cell for part in self)
+
+    def grow(self):
+        coords = array("H", [0]) * (2 * len(self.coords))
+        for i, (x, y) in enumerate(self):
+            coords[2 * i] = x
+            coords[2 * i + 1] = y
+        self.coords = coords
+        self.start = 0
+
+    def append(self, cell):
+        if self.length == len(self.coords) // 2:
+            self.grow()
+        index = 2 * ((self.start + self.length) % (len(self.coords) // 2))
+        self.coords[index], self.coords[index + 1] = cell
+        self.length += 1
+
+    def appendleft(self, cell):
+        if self.length == len(self.coords) // 2:
+            self.grow()
+        self.start = (self.start - 1) % (len(self.coords) // 2)
+        self.coords[2 * self.start], self.coords[2 * self.start + 1] = cell
+        self.length += 1
+
+    def pop(self):
+        cell = self[-1]
+        self.length -= 1
+        return cell
+
+    def clear(self):
+        self.start = 0
+        self.length = 0
+
+    def snapshot(self):
+        return (array("H", self.coords), self.start, self.length)
+
+    def restore(self, snapshot):
+        coords, self.start, self.length = snapshot
+        self.coords = array("H", coords)
+
+class Level:
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width=WIDTH, height=HEIGHT, cells=None):
+        self.width = width
+        self.height = height
+        self.cells = make_grid(width, height) if cells is None else cells
+
+    def snapshot(self):
+        return bytes(self.cells)
+
+    def restore(self, snapshot):
+        self.cells = bytearray(snapshot)
+
+class ArenaSnake:
+    __slots__ = ("body", "direction", "ai", "alive", "score")
+
+    def __init__(self, body, direction, ai):
+        self.body = body
+        self.direction = direction
+        self.ai = ai
+        self.alive = True
+        self.score = 0
+
+    def snapshot(self):
+        return (self.body.snapshot(), self.direction, self.ai, self.alive, self.score)
+
+    def restore(self, snapshot):
+        body, self.direction, self.ai, self.alive, self.score = snapshot
+        self.body.restore(body)
 
 def clear():
     os.system("cls" if os.name == "nt" else "clear")
 
+def wait_key(timeout=None):
+    global keypress_time
+    key = read_key(timeout)
+    if key and keypress_time is None:
+        keypress_time = time.perf_counter()
+    return key
+
+def get_key():
+    return wait_key(0)
+
+def record_frame():
+    global keypress_time
+    if keypress_time is not None:
+        latency_ms = (time.perf_counter() - keypress_time) * 1000
+        latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        keypress_time = None
+
+def print_latency_histogram():
+    if not os.environ.get("CLI_GAMES_LATENCY"):
+        return
+    total = sum(latency_histogram)
+    labels = [f"<= {bucket} ms" for bucket in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]} ms"]
+    print(f"\nKeypress-to-frame latency ({total} samples)")
+    for label, count in zip(labels, latency_histogram):
+        bar = "#" * (40 * count // total) if total else ""
+        print(f"{label:>10} {count:>6} {bar}")
+
 def title():
     clear()
     title = [
@@ -63,46 +245,258 @@ def title():
     print("\n" + " " * ((WIDTH - len(src)) // 2) + src)
     print("\n" + " " * ((WIDTH - len(prompt)) // 2) + prompt)
     while True:
-        key = get_key()
+        key = wait_key()
         if key in [b'\r', b'\n', 13, b'\r\n']:
             break
-        time.sleep(0.1)
 
-def spawn_food(snake):
-    while True:
-        x = random.randint(1, WIDTH - 2)
-        y = random.randint(1, HEIGHT - 2)
-        if (x, y) not in snake:
-            return (x, y)
-
-def draw_board(snake, food, score):
-    board = [[EMPTY_CHAR for _ in range(WIDTH)] for _ in range(HEIGHT)]
-    for i in range(WIDTH):
-        board[0][i] = BORDER_CHAR
-        board[HEIGHT - 1][i] = BORDER_CHAR
-    for i in range(HEIGHT):
-        board[i][0] = BORDER_CHAR
-        board[i][WIDTH - 1] = BORDER_CHAR
+def add_border(cells, width, height):
+    for x in range(width):
+        cells[x] = WALL_CELL
+        cells[(height - 1) * width + x] = WALL_CELL
+    for y in range(height):
+        cells[y * width] = WALL_CELL
+        cells[y * width + width - 1] = WALL_CELL
+    return cells
+
+def make_grid(width, height):
+    return add_border(bytearray(width * height), width, height)
+
+def carve(cells, width, x, y, carve_width, carve_height):
+    for row in range(y, y + carve_height):
+        start = row * width + x
+        cells[start:start + carve_width] = bytes(carve_width)
+
+def generate_maze(width, height, rng):
+    if width - 2 < MAZE_CORRIDOR or height - 2 < MAZE_CORRIDOR:
+        return make_grid(width, height)
+    step = MAZE_CORRIDOR + 1
+    columns = (width - 2 - MAZE_CORRIDOR) // step + 1
+    rows = (height - 2 - MAZE_CORRIDOR) // step + 1
+    cells = bytearray([WALL_CELL]) * (width * height)
+    visited = bytearray(columns * rows)
+    visited[0] = 1
+    carve(cells, width, 1, 1, MAZE_CORRIDOR, MAZE_CORRIDOR)
+    stack = [(0, 0)]
+    while stack:
+        cx, cy = stack[-1]
+        neighbours = [
+            (cx + dx, cy + dy) for dx, dy in DIRECTIONS
+            if 0 <= cx + dx < columns and 0 <= cy + dy < rows and not visited[(cy + dy) * columns + cx + dx]
+        ]
+        if not neighbours:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(neighbours)
+        visited[ny * columns + nx] = 1
+        carve(cells, width, 1 + min(cx, nx) * step, 1 + min(cy, ny) * step,
+              MAZE_CORRIDOR + abs(nx - cx) * step, MAZE_CORRIDOR + abs(ny - cy) * step)
+        stack.append((nx, ny))
+    for cy in range(rows):
+        for cx in range(columns):
+            if cx + 1 < columns and rng.random() < MAZE_LOOPS:
+                carve(cells, width, 1 + cx * step, 1 + cy * step, MAZE_CORRIDOR + step, MAZE_CORRIDOR)
+            if cy + 1 < rows and rng.random() < MAZE_LOOPS:
+                carve(cells, width, 1 + cx * step, 1 + cy * step, MAZE_CORRIDOR, MAZE_CORRIDOR + step)
+    return cells
+
+def generate_rooms(width, height, rng):
+    cells = make_grid(width, height)
+    walls_x = list(range(ROOM_SIZE, width - ROOM_SIZE // 2, ROOM_SIZE))
+    walls_y = list(range(ROOM_SIZE, height - ROOM_SIZE // 2, ROOM_SIZE))
+    for x in walls_x:
+        for y in range(1, height - 1):
+            cells[y * width + x] = WALL_CELL
+    for y in walls_y:
+        cells[y * width + 1:y * width + width - 1] = bytes([WALL_CELL]) * (width - 2)
+    bands_x = list(zip([0] + walls_x, walls_x + [width - 1]))
+    bands_y = list(zip([0] + walls_y, walls_y + [height - 1]))
+    for x in walls_x:
+        for top, bottom in bands_y:
+            door = min(ROOM_DOOR, bottom - top - 1)
+            y = rng.randint(top + 1, bottom - door)
+            carve(cells, width, x, y, 1, door)
+    for y in walls_y:
+        for left, right in bands_x:
+            door = min(ROOM_DOOR, right - left - 1)
+            x = rng.randint(left + 1, right - door)
+            carve(cells, width, x, y, door, 1)
+    return cells
+
+def generate_blobs(width, height, rng):
+    cells = make_grid(width, height)
+    for _ in range(width * height // BLOB_AREA):
+        x = rng.randint(1, width - 2)
+        y = rng.randint(1, height - 2)
+        for _ in range(rng.randint(1, BLOB_SIZE)):
+            cells[y * width + x] = WALL_CELL
+            dx, dy = rng.choice(DIRECTIONS)
+            x = min(max(x + dx, 1), width - 2)
+            y = min(max(y + dy, 1), height - 2)
+    return cells
+
+def flood_fill(cells, width, start, seen):
+    region = [start]
+    seen[start] = 1
+    for index in region:
+        for neighbour in (index - width, index - 1, index + 1, index + width):
+            if not seen[neighbour] and cells[neighbour] == EMPTY_CELL:
+                seen[neighbour] = 1
+                region.append(neighbour)
+    return region
+
+def connect_level(cells, width):
+    seen = bytearray(len(cells))
+    regions = []
+    index = cells.find(EMPTY_CELL)
+    while index != -1:
+        if not seen[index]:
+            regions.append(flood_fill(cells, width, index, seen))
+        index = cells.find(EMPTY_CELL, index + 1)
+    regions.sort(key=len)
+    for region in regions[:-1]:
+        for index in region:
+            cells[index] = WALL_CELL
+    return cells
+
+def generate_level(kind, width, height, seed=None):
+    rng = random.Random(seed)
+    if kind == "empty":
+        return Level(width, height)
+    if kind == "maze":
+        cells = generate_maze(width, height, rng)
+    elif kind == "rooms":
+        cells = generate_rooms(width, height, rng)
+    elif kind == "blobs":
+        cells = generate_blobs(width, height, rng)
+    else:
+        raise ValueError(f"unknown level kind: {kind}")
+    return Level(width, height, connect_level(cells, width))
+
+def save_level(level, path):
+    cells = bytes(level.cells).translate(WALLS_ONLY)
+    cells += bytes(-len(cells) % 8)
+    packed = bytes(PACK_TABLE[cells[i:i + 8]] for i in range(0, len(cells), 8))
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            file.write(LEVEL_HEADER.pack(LEVEL_MAGIC, level.width, level.height))
+            file.write(zlib.compress(packed))
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+def load_level(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < LEVEL_HEADER.size:
+        raise ValueError(f"{path} is not a snake level file")
+    magic, width, height = LEVEL_HEADER.unpack_from(data)
+    if magic != LEVEL_MAGIC:
+        raise ValueError(f"{path} is not a snake level file")
+    if not (3 <= width <= MAX_LEVEL_SIZE and 3 <= height <= MAX_LEVEL_SIZE):
+        raise ValueError(f"{path} has an invalid size of {width}x{height}")
+    try:
+        packed = zlib.decompress(data[LEVEL_HEADER.size:])
+    except zlib.error:
+        raise ValueError(f"{path} is corrupt")
+    cells = bytearray(b"".join(UNPACK_TABLE[byte] for byte in packed)[:width * height])
+    if len(cells) != width * height:
+        raise ValueError(f"{path} is truncated")
+    connect_level(add_border(cells, width, height), width)
+    if EMPTY_CELL not in cells:
+        raise ValueError(f"{path} has no open cells")
+    return Level(width, height, cells)
+
+def get_level(kind, width, height, seed=None):
+    if kind not in LEVEL_KINDS:
+        return load_level(kind)
+    if seed is None:
+        return generate_level(kind, width, height)
+    path = os.path.join(LEVEL_CACHE_DIR, f"{kind}-{width}x{height}-{seed}.lvl")
+    if os.path.exists(path):
+        try:
+            return load_level(path)
+        except (OSError, ValueError):
+            pass
+    level = generate_level(kind, width, height, seed)
+    try:
+        os.makedirs(LEVEL_CACHE_DIR, exist_ok=True)
+        save_level(level, path)
+    except OSError:
+        pass
+    return level
+
+def place_snake(level, snake):
+    for x, y in snake:
+        level.cells[y * level.width + x] = SNAKE_CELL
+
+def free_cell(level, foods):
+    for _ in range(FREE_CELL_ATTEMPTS):
+        index = random.randrange(len(level.cells))
+        if level.cells[index] == EMPTY_CELL:
+            cell = (index % level.width, index // level.width)
+            if cell not in foods:
+                return cell
+    index = level.cells.find(EMPTY_CELL)
+    while index != -1:
+        cell = (index % level.width, index // level.width)
+        if cell not in foods:
+            return cell
+        index = level.cells.find(EMPTY_CELL, index + 1)
+    return None
+
+def open_direction(level, cell, preferred):
+    x, y = cell
+    for dx, dy in [preferred] + DIRECTIONS:
+        if level.cells[(y + dy) * level.width + x + dx] == EMPTY_CELL:
+            return (dx, dy)
+    return preferred
+
+def spawn_food(snake, level):
+    return free_cell(level, ())
+
+def view_window(level, focus):
+    columns, lines = shutil.get_terminal_size((level.width, level.height + 3))
+    view_width = max(1, min(level.width, columns))
+    view_height = max(1, min(level.height, lines - 3))
+    left = min(max(focus[0] - view_width // 2, 0), level.width - view_width)
+    top = min(max(focus[1] - view_height // 2, 0), level.height - view_height)
+    return left, top, view_width, view_height
+
+def level_rows(level, left, top, view_width, view_height):
+    rows = []
+    for y in range(top, top + view_height):
+        start = y * level.width + left
+        rows.append([BORDER_CHAR if cell == WALL_CELL else EMPTY_CHAR for cell in level.cells[start:start + view_width]])
+    return rows
+
+def draw_board(snake, food, score, level=None):
+    if level is None:
+        level = Level()
+    left, top, view_width, view_height = view_window(level, snake[0])
+    board = level_rows(level, left, top, view_width, view_height)
     for i, (x, y) in enumerate(snake):
-        if 0 < x < WIDTH - 1 and 0 < y < HEIGHT - 1:
+        if left <= x < left + view_width and top <= y < top + view_height:
             if i == 0:
-                board[y][x] = HEAD_CHAR
+                board[y - top][x - left] = HEAD_CHAR
             else:
                 prev_x, prev_y = snake[i - 1]
                 if prev_x == x:
-                    board[y][x] = SNAKE_VER_CHAR
+                    board[y - top][x - left] = SNAKE_VER_CHAR
                 elif prev_y == y:
-                    board[y][x] = SNAKE_HOR_CHAR
-    if food and 0 < food[0] < WIDTH - 1 and 0 < food[1] < HEIGHT - 1:
-        board[food[1]][food[0]] = FOOD_CHAR
+                    board[y - top][x - left] = SNAKE_HOR_CHAR
+    if food and left <= food[0] < left + view_width and top <= food[1] < top + view_height:
+        board[food[1] - top][food[0] - left] = FOOD_CHAR
     clear()
     print(f"Score: {score}")
     for row in board:
         print("".join(row))
     print("Controls: WASD or arrow keys to move, spacebar to quit")
+    record_frame()
 
-def check_input(direction):
-    key = get_key()
+def check_input(direction, timeout=0):
+    key = wait_key(timeout)
     if not key:
         return True, direction
     if key == b" ":
@@ -127,44 +521,214 @@ def check_input(direction):
             return True, (1, 0)
     return True, direction
 
-def update_game(snake, direction, food):
+def update_game(snake, direction, food, level):
+    cells = level.cells
+    width = level.width
     head_x, head_y = snake[0]
     dir_x, dir_y = direction
     new_head = (head_x + dir_x, head_y + dir_y)
     new_x, new_y = new_head
-    if new_x <= 0 or new_x >= WIDTH - 1 or new_y <= 0 or new_y >= HEIGHT - 1:
-        return False, snake, food, 0
-    if new_head in snake[:-1]:
+    if cells[new_y * width + new_x] != EMPTY_CELL and new_head != snake[-1]:
         return False, snake, food, 0
-    snake.insert(0, new_head)
+    snake.appendleft(new_head)
+    cells[new_y * width + new_x] = SNAKE_CELL
     ate_food = False
     if new_head == food:
         ate_food = True
-        food = spawn_food(snake)
+        food = spawn_food(snake, level)
     else:
-        snake.pop()
+        tail_x, tail_y = snake.pop()
+        if (tail_x, tail_y) != new_head:
+            cells[tail_y * width + tail_x] = EMPTY_CELL
+        if food is None:
+            food = spawn_food(snake, level)
     return True, snake, food, 1 if ate_food else 0
 
-def main():
+def new_arena_snake(level, foods, ai):
+    cell = free_cell(level, foods)
+    if cell is None:
+        return None
+    x, y = cell
+    level.cells[y * level.width + x] = SNAKE_CELL
+    return ArenaSnake(SnakeBody([(x, y)]), open_direction(level, (x, y), random.choice(DIRECTIONS)), ai)
+
+def choose_ai_direction(snake, level, foods):
+    head_x, head_y = snake.body[0]
+    dir_x, dir_y = snake.direction
+    target = None
+    if foods:
+        target = min(foods, key=lambda food: abs(food[0] - head_x) + abs(food[1] - head_y))
+    best_direction = None
+    best_distance = None
+    for direction in DIRECTIONS:
+        if direction == (-dir_x, -dir_y):
+            continue
+        x = head_x + direction[0]
+        y = head_y + direction[1]
+        if level.cells[y * level.width + x] != EMPTY_CELL:
+            continue
+        if target:
+            distance = abs(target[0] - x) + abs(target[1] - y)
+        else:
+            distance = random.random()
+        if best_direction is None or distance < best_distance:
+            best_direction = direction
+            best_distance = distance
+    return best_direction or snake.direction
+
+def update_arena(snakes, foods, level):
+    cells = level.cells
+    width = level.width
+    moves = []
+    heads = {}
+    old_heads = {}
+    for snake in snakes:
+        if not snake.alive:
+            continue
+        if snake.ai:
+            snake.direction = choose_ai_direction(snake, level, foods)
+        head_x, head_y = snake.body[0]
+        dir_x, dir_y = snake.direction
+        new_head = (head_x + dir_x, head_y + dir_y)
+        moves.append((snake, (head_x, head_y), new_head))
+        heads[new_head] = heads.get(new_head, 0) + 1
+        old_heads[(head_x, head_y)] = new_head
+    for snake, old_head, new_head in moves:
+        if new_head not in foods:
+            tail_x, tail_y = snake.body.pop()
+            cells[tail_y * width + tail_x] = EMPTY_CELL
+    for snake, old_head, new_head in moves:
+        new_x, new_y = new_head
+        swapped = old_heads.get(new_head) == old_head
+        if heads[new_head] > 1 or swapped or cells[new_y * width + new_x] != EMPTY_CELL:
+            snake.alive = False
+    eaten = 0
+    for snake, old_head, new_head in moves:
+        if not snake.alive:
+            for x, y in snake.body:
+                cells[y * width + x] = EMPTY_CELL
+            snake.body.clear()
+            continue
+        new_x, new_y = new_head
+        snake.body.appendleft(new_head)
+        cells[new_y * width + new_x] = SNAKE_CELL
+        if new_head in foods:
+            foods.remove(new_head)
+            snake.score += 1
+            eaten += 1
+    for _ in range(eaten):
+        food = free_cell(level, foods)
+        if food:
+            foods.add(food)
+    for i, snake in enumerate(snakes):
+        if snake.ai and not snake.alive:
+            snakes[i] = new_arena_snake(level, foods, True) or snake
+    return snakes[0].alive
+
+def draw_arena(snakes, foods, level):
+    left, top, view_width, view_height = view_window(level, snakes[0].body[0] if snakes[0].alive else (0, 0))
+    board = level_rows(level, left, top, view_width, view_height)
+    for x, y in foods:
+        if left <= x < left + view_width and top <= y < top + view_height:
+            board[y - top][x - left] = FOOD_CHAR
+    for snake in snakes:
+        if not snake.alive:
+            continue
+        head_char = AI_HEAD_CHAR if snake.ai else HEAD_CHAR
+        body_char = AI_BODY_CHAR if snake.ai else SNAKE_HOR_CHAR
+        for i, (x, y) in enumerate(snake.body):
+            if left <= x < left + view_width and top <= y < top + view_height:
+                board[y - top][x - left] = head_char if i == 0 else body_char
+    clear()
+    alive = sum(1 for snake in snakes if snake.alive)
+    print(f"Score: {snakes[0].score} | Snakes: {alive}")
+    for row in board:
+        print("".join(row))
+    print("Controls: WASD or arrow keys to move, spacebar to quit")
+    record_frame()
+
+def main(level=None):
     title()
-    snake = [(WIDTH // 4, HEIGHT // 2)]
-    direction = (1, 0)
-    food = spawn_food(snake)
+    if level is None:
+        level = Level()
+    start = (level.width // 4, level.height // 2)
+    if level.cells[start[1] * level.width + start[0]] != EMPTY_CELL:
+        start = free_cell(level, ())
+    snake = SnakeBody([start])
+    direction = open_direction(level, start, (1, 0))
+    place_snake(level, snake)
+    food = spawn_food(snake, level)
     score = 0
     running = True
-    draw_board(snake, food, score)
-    time.sleep(1)
+    draw_board(snake, food, score, level)
+    next_tick = time.perf_counter() + 1
     while running:
-        running, direction = check_input(direction)
+        running, direction = check_input(direction, max(0, next_tick - time.perf_counter()))
         if not running:
             break
-        running, snake, food, points = update_game(snake, direction, food)
+        time.sleep(max(0, next_tick - time.perf_counter()))
+        running, snake, food, points = update_game(snake, direction, food, level)
         score += points
-        draw_board(snake, food, score)
-        time.sleep(1 / FPS)
+        draw_board(snake, food, score, level)
+        next_tick = time.perf_counter() + 1 / FPS
     clear()
     print(f"\n\n{'=' * 20}\n  GAME OVER\n  Final Score: {score}\n{'=' * 20}")
+    print_latency_histogram()
+    time.sleep(2)
+
+def arena_main(level=None):
+    title()
+    if level is None:
+        level = Level(ARENA_WIDTH, ARENA_HEIGHT)
+    foods = set()
+    snakes = [new_arena_snake(level, foods, False)]
+    snakes[0].direction = open_direction(level, snakes[0].body[0], (1, 0))
+    for _ in range(ARENA_AI_SNAKES):
+        snake = new_arena_snake(level, foods, True)
+        if snake:
+            snakes.append(snake)
+    for _ in range(ARENA_FOOD):
+        food = free_cell(level, foods)
+        if food:
+            foods.add(food)
+    running = True
+    draw_arena(snakes, foods, level)
+    next_tick = time.perf_counter() + 1
+    while running:
+        running, direction = check_input(snakes[0].direction, max(0, next_tick - time.perf_counter()))
+        if not running:
+            break
+        time.sleep(max(0, next_tick - time.perf_counter()))
+        snakes[0].direction = direction
+        running = update_arena(snakes, foods, level)
+        draw_arena(snakes, foods, level)
+        next_tick = time.perf_counter() + 1 / FPS
+    clear()
+    print(f"\n\n{'=' * 20}\n  GAME OVER\n  Final Score: {snakes[0].score}\n{'=' * 20}")
+    print_latency_histogram()
     time.sleep(2)
 
+def parse_size(size):
+    width, _, height = size.lower().partition("x")
+    if not (width.isdigit() and height.isdigit()):
+        raise argparse.ArgumentTypeError(f"invalid board size: {size}")
+    if not (MIN_LEVEL_SIZE <= int(width) <= MAX_LEVEL_SIZE and MIN_LEVEL_SIZE <= int(height) <= MAX_LEVEL_SIZE):
+        raise argparse.ArgumentTypeError(f"board size must be between {MIN_LEVEL_SIZE} and {MAX_LEVEL_SIZE} on each side")
+    return int(width), int(height)
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Play snake in the terminal.")
+    parser.add_argument("--arena", action="store_true", help="play against computer-controlled snakes")
+    parser.add_argument("--level", default="empty", help="empty, maze, rooms, blobs, or the path of a saved level")
+    parser.add_argument("--size", type=parse_size, help="board size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, help="generate (and cache) the same level every time")
+    args = parser.parse_args()
+    width, height = args.size or ((ARENA_WIDTH, ARENA_HEIGHT) if args.arena else (WIDTH, HEIGHT))
+    try:
+        level = get_level(args.level, width, height, args.seed)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.arena:
+        arena_main(level)
+    else:
+        main(level)
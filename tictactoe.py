@@ -1,31 +1,54 @@
 import os
+import bisect
 import time
 import random
 
 try:
     import msvcrt
-    def get_key():
-        if msvcrt.kbhit():
-            key = msvcrt.getch()
-            return key
-        return None
+    import sys, ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.ReadConsoleInputW.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    console_input = msvcrt.get_osfhandle(sys.stdin.fileno())
+    def read_key(timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        record = ctypes.create_string_buffer(20)
+        count = wintypes.DWORD()
+        while not msvcrt.kbhit():
+            if deadline is None:
+                wait_ms = 0xFFFFFFFF
+            else:
+                wait_ms = int(max(0, deadline - time.perf_counter()) * 1000)
+            if kernel32.WaitForSingleObject(console_input, wait_ms) != 0:
+                return None
+            if not msvcrt.kbhit():
+                kernel32.ReadConsoleInputW(console_input, record, 1, ctypes.byref(count))
+        return msvcrt.getch()
 except ImportError:
     try:
         import termios
-        import sys, tty, select
-        def get_key():
-            if sys.stdin.isatty():
-                fd = sys.stdin.fileno()
-                old_settings = termios.tcgetattr(fd)
-                try:
-                    tty.setcbreak(fd)
-                    if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-                        return sys.stdin.read(1)
-                finally:
-                    termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        import sys, tty, select, atexit
+        terminal_settings = None
+        def read_key(timeout=None):
+            global terminal_settings
+            fd = sys.stdin.fileno()
+            if terminal_settings is None and sys.stdin.isatty():
+                terminal_settings = termios.tcgetattr(fd)
+                tty.setcbreak(fd)
+                atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, terminal_settings)
+            if select.select([fd], [], [], timeout)[0]:
+                key = os.read(fd, 1)
+                if not key:
+                    sys.exit()
+                return key
             return None
     except ImportError:
-        def get_key():
+        def read_key(timeout=None):
+            if timeout is None:
+                raise SystemExit
+            time.sleep(timeout)
             return None
 
 WIDTH = 40
@@ -36,11 +59,97 @@ COMPUTER = "O"
 GRID_CHAR = "│"
 HORIZ_CHAR = "─"
 CROSS_CHAR = "┼"
-FPS = 10
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+FULL_MASK = 0b111111111
+
+latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+keypress_time = None
+
+class Board:
+    __slots__ = ("player", "computer")
+
+    def __init__(self, player=0, computer=0):
+        self.player = player
+        self.computer = computer
+
+    def __len__(self):
+        return 9
+
+    def __getitem__(self, index):
+        bit = 1 << index
+        if self.player & bit:
+            return PLAYER
+        if self.computer & bit:
+            return COMPUTER
+        return EMPTY
+
+    def __setitem__(self, index, cell):
+        bit = 1 << index
+        self.player &= ~bit
+        self.computer &= ~bit
+        if cell == PLAYER:
+            self.player |= bit
+        elif cell == COMPUTER:
+            self.computer |= bit
+
+    def __iter__(self):
+        for index in range(9):
+            yield self[index]
+
+    def __contains__(self, cell):
+        if cell == EMPTY:
+            return (self.player | self.computer) != FULL_MASK
+        if cell == PLAYER:
+            return self.player != 0
+        if cell == COMPUTER:
+            return self.computer != 0
+        return False
+
+    def copy(self):
+        return Board(self.player, self.computer)
+
+    def snapshot(self):
+        return self.player | self.computer << 9
+
+    def restore(self, snapshot):
+        self.player = snapshot & FULL_MASK
+        self.computer = snapshot >> 9
 
 def clear():
     os.system("cls" if os.name == "nt" else "clear")
 
+def wait_key(timeout=None):
+    global keypress_time
+    key = read_key(timeout)
+    if key and keypress_time is None:
+        keypress_time = time.perf_counter()
+    return key
+
+def get_key():
+    return wait_key(0)
+
+def record_frame():
+    global keypress_time
+    if keypress_time is not None:
+        latency_ms = (time.perf_counter() - keypress_time) * 1000
+        latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        keypress_time = None
+
+def print_latency_histogram():
+    if not os.environ.get("CLI_GAMES_LATENCY"):
+        return
+    total = sum(latency_histogram)
+    labels = [f"<= {bucket} ms" for bucket in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]} ms"]
+    print(f"\nKeypress-to-frame latency ({total} samples)")
+    for label, count in zip(labels, latency_histogram):
+        bar = "#" * (40 * count // total) if total else ""
+        print(f"{label:>10} {count:>6} {bar}")
+
 def title():
     clear()
     title = [
@@ -63,13 +172,12 @@ def title():
     print("\n" + " " * ((title_width - len(src)) // 2) + src)
     print("\n" + " " * ((title_width - len(prompt)) // 2) + prompt)
     while True:
-        key = get_key()
+        key = wait_key()
         if key in [b'\r', b'\n', 13, b'\r\n']:
             break
-        time.sleep(0.1)
 
 def initialize_board():
-    return [EMPTY] * 9
+    return Board()
 
 def draw_board(board, cursor_pos, player_turn, message=""):
     clear()
@@ -94,17 +202,15 @@ def draw_board(board, cursor_pos, player_turn, message=""):
         print("\nYour turn (X)")
     else:
         print("\nComputer's turn (O)")
+    record_frame()
 
 def check_winner(board):
-    win_conditions = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],
-        [0, 4, 8], [2, 4, 6]
-    ]
-    for condition in win_conditions:
-        if board[condition[0]] != EMPTY and board[condition[0]] == board[condition[1]] == board[condition[2]]:
-            return board[condition[0]]
-    if EMPTY not in board:
+    for mask in WIN_MASKS:
+        if board.player & mask == mask:
+            return PLAYER
+        if board.computer & mask == mask:
+            return COMPUTER
+    if board.player | board.computer == FULL_MASK:
         return "TIE"
     return None
 
@@ -128,8 +234,8 @@ def computer_move(board):
         return random.choice(available_corners)
     return random.choice(empty_cells)
 
-def check_input(cursor_pos, board):
-    key = get_key()
+def check_input(cursor_pos, board, timeout=0):
+    key = wait_key(timeout)
     if not key:
         return cursor_pos, False, True
     if key == b" ":
@@ -172,8 +278,9 @@ def main():
         while not game_over:
             draw_board(board, cursor_pos, player_turn, message)
             if player_turn:
-                cursor_pos, make_move, running = check_input(cursor_pos, board)
+                cursor_pos, make_move, running = check_input(cursor_pos, board, None)
                 if not running:
+                    print_latency_histogram()
                     return
                 if make_move:
                     board[cursor_pos] = PLAYER
@@ -202,14 +309,13 @@ def main():
                 print("\nPress Enter to play again, Space to quit")
                 waiting_for_key = True
                 while waiting_for_key:
-                    key = get_key()
+                    key = wait_key()
                     if key in [b'\r', b'\n', 13, b'\r\n']:
                         waiting_for_key = False
                     elif key == b" ":
                         play_again = False
                         waiting_for_key = False
-                    time.sleep(0.1)
-            time.sleep(1 / FPS)
+    print_latency_histogram()
 
 if __name__ == "__main__":
     main()